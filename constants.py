@@ -2,6 +2,7 @@
 Game constants and configuration settings.
 """
 
+import functools
 import pygame
 
 # Window settings
@@ -70,6 +71,16 @@ class Colors:
     GARBAGE = (128, 128, 128)
     GHOST = (128, 128, 128, GHOST_ALPHA)
 
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def with_alpha(color, alpha):
+        """Memoized (r, g, b, alpha) tuple for a base color.
+
+        Hot draw paths build RGBA variants every call via tuple
+        unpacking; the cache makes repeat combinations a dict hit.
+        """
+        return (color[0], color[1], color[2], alpha)
+
 # Tetris pieces (Standard Rotation System - SRS)
 TETROMINOS = {
     'I': {
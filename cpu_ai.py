@@ -65,7 +65,13 @@ class TetrisAI:
         for rotation in range(4):
             test_piece = game.current_piece.copy()
             test_piece.rotation = RotationState(rotation)
-            
+
+            # Skip rotations with empty shapes (pieces with fewer than 4
+            # distinct rotations); a blockless piece would never collide
+            # and the drop loop below would not terminate
+            if not test_piece.get_blocks():
+                continue
+
             # Try all horizontal positions
             for x in range(-3, game.board.width + 3):
                 test_piece.x = x
@@ -140,12 +146,8 @@ class TetrisAI:
     
     def _create_temp_board(self, piece: Tetromino, board: TetrisBoard) -> List[List[bool]]:
         """Create temporary board with piece placed."""
-        temp_board = []
-        
-        # Copy original board
-        for row in board.grid:
-            temp_row = [cell is not None for cell in row]
-            temp_board.append(temp_row)
+        # Copy original board (uint8 grid of cell ids; nonzero == filled)
+        temp_board = (board.grid != 0).tolist()
         
         # Place piece
         blocks = piece.get_blocks()
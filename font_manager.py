@@ -35,15 +35,22 @@ class FontManager:
             'source_code': os.path.join(font_dir, 'SourceCodePro-Regular.ttf'),
         }
         
-        # Check which fonts are available
+        # Check which fonts are available with one directory read instead
+        # of a stat syscall per file
+        try:
+            with os.scandir(font_dir) as it:
+                present = {entry.name for entry in it}
+        except OSError:
+            present = set()
+
         available_fonts = {}
         for font_name, font_path in self.font_paths.items():
-            if os.path.exists(font_path):
+            if os.path.basename(font_path) in present:
                 available_fonts[font_name] = font_path
                 print(f"[OK] Font available: {font_name}")
             else:
                 print(f"[WARN] Font missing: {font_name} at {font_path}")
-        
+
         self.font_paths = available_fonts
     
     def _load_fonts(self):
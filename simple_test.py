@@ -5,7 +5,6 @@
 
 import pygame
 import sys
-import time
 from constants import *
 
 def simple_test():
@@ -25,13 +24,14 @@ def simple_test():
         print("[OK] GameManager作成完了")
         
         print("5フレームテスト...")
+        clock = pygame.time.Clock()
         for i in range(5):
             print(f"フレーム {i+1}/5")
             gm.handle_events()
             gm.update(1.0/60.0)
             gm.draw(screen)
             pygame.display.flip()
-            time.sleep(0.1)
+            clock.tick(10)  # sleep(0.1) の代わりにSDLと同期したペーシング
         
         print("[SUCCESS] 5フレーム完了")
         
@@ -9,6 +9,25 @@ import sys
 import time
 from debug_logger import init_debug_logger, close_debug_logger
 
+def snapshot_controller_state(joystick):
+    """コントローラー状態のワンショットスナップショットを取得
+
+    ボタン/軸を1回だけ読み取り、(押下中ボタンID一覧, 動いている軸の値) を返す。
+    監視ループ内ではイベント (JOYBUTTONDOWN/JOYBUTTONUP) に任せるため、
+    ポーリングは初期スナップショットのみに限定する。
+    """
+    pressed_buttons = [
+        button_id for button_id in range(joystick.get_numbuttons())
+        if joystick.get_button(button_id)
+    ]
+    active_axes = {
+        axis_id: joystick.get_axis(axis_id)
+        for axis_id in range(joystick.get_numaxes())
+        if abs(joystick.get_axis(axis_id)) > 0.1  # 小さな変化は無視
+    }
+    return pressed_buttons, active_axes
+
+
 def test_bluetooth_controller_debug():
     """Bluetoothコントローラーのデバッグテスト"""
     print("🔍 Bluetoothコントローラー・デバッグテスト開始")
@@ -87,19 +106,16 @@ def test_bluetooth_controller_debug():
             joystick = controller_data['joystick']
             try:
                 debug.log_debug(f"Testing basic state reading for controller {controller_id}", "test1")
-                
-                # ボタン状態読み取り
-                for button_id in range(joystick.get_numbuttons()):
-                    pressed = joystick.get_button(button_id)
-                    if pressed:
-                        debug.log_debug(f"Button {button_id} pressed", f"controller_{controller_id}")
-                
-                # 軸状態読み取り
-                for axis_id in range(joystick.get_numaxes()):
-                    value = joystick.get_axis(axis_id)
-                    if abs(value) > 0.1:  # 小さな変化は無視
-                        debug.log_debug(f"Axis {axis_id} value: {value:.3f}", f"controller_{controller_id}")
-                
+
+                # ワンショットスナップショット（以降はイベント駆動で監視）
+                pressed_buttons, active_axes = snapshot_controller_state(joystick)
+
+                for button_id in pressed_buttons:
+                    debug.log_debug(f"Button {button_id} pressed", f"controller_{controller_id}")
+
+                for axis_id, value in active_axes.items():
+                    debug.log_debug(f"Axis {axis_id} value: {value:.3f}", f"controller_{controller_id}")
+
                 print(f"  ✅ コントローラー {controller_id}: 基本読み取り成功")
                 
             except Exception as e:
@@ -113,32 +129,41 @@ def test_bluetooth_controller_debug():
         start_time = time.time()
         event_count = 0
         error_count = 0
-        
+        console_buf = []  # 1秒ごとにまとめて出力（ループ内のstdout書き込みを削減）
+        last_flush = start_time
+
         print("   コントローラーのボタンや軸を動かしてください...")
-        
+
         while time.time() - start_time < 10.0:
             try:
                 # イベント処理
                 for event in pygame.event.get():
                     event_count += 1
                     debug.log_pygame_event(event)
-                    
+
                     if event.type == pygame.JOYDEVICEADDED:
                         debug.log_info(f"Controller hot-plugged: {event.device_index}", "test2")
-                        print(f"    🔌 コントローラー {event.device_index} が接続されました")
-                    
+                        console_buf.append(f"    🔌 コントローラー {event.device_index} が接続されました")
+
                     elif event.type == pygame.JOYDEVICEREMOVED:
                         debug.log_info(f"Controller disconnected: {event.device_index}", "test2")
-                        print(f"    🔌 コントローラー {event.device_index} が切断されました")
-                    
+                        console_buf.append(f"    🔌 コントローラー {event.device_index} が切断されました")
+
                     elif event.type == pygame.JOYBUTTONDOWN:
                         debug.log_info(f"Button pressed: joy={event.joy}, button={event.button}", "test2")
-                        print(f"    🎮 ボタン {event.button} 押下 (コントローラー {event.joy})")
-                    
+                        console_buf.append(f"    🎮 ボタン {event.button} 押下 (コントローラー {event.joy})")
+
                     elif event.type == pygame.JOYAXISMOTION:
                         if abs(event.value) > 0.5:
                             debug.log_info(f"Axis moved: joy={event.joy}, axis={event.axis}, value={event.value:.3f}", "test2")
-                            print(f"    🕹️  軸 {event.axis} 移動: {event.value:.3f} (コントローラー {event.joy})")
+                            console_buf.append(f"    🕹️  軸 {event.axis} 移動: {event.value:.3f} (コントローラー {event.joy})")
+
+                # 1秒境界でまとめてフラッシュ
+                now = time.time()
+                if console_buf and now - last_flush >= 1.0:
+                    print('\n'.join(console_buf))
+                    console_buf.clear()
+                    last_flush = now
                 
                 # 安全な状態ポーリング
                 for controller_id, controller_data in controllers.items():
@@ -167,6 +192,10 @@ def test_bluetooth_controller_debug():
                     print("    🛑 エラーが多すぎます。テストを停止します。")
                     break
         
+        if console_buf:
+            print('\n'.join(console_buf))
+            console_buf.clear()
+
         elapsed = time.time() - start_time
         debug.log_info(f"Monitoring completed: {elapsed:.1f}s, {event_count} events, {error_count} errors", "test2")
         print(f"  ✅ 監視完了: {elapsed:.1f}秒, {event_count}イベント, {error_count}エラー")
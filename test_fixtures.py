@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+テストスクリプト共通のpygame初期化フィクスチャ
+
+各 test_*.py が個別に `pygame.init()` + `pygame.display.set_mode(...)` を
+繰り返すとSDLサブシステム初期化を毎回払い直すことになるため、
+ここで一度だけ初期化して共有する。
+"""
+
+import os
+
+# ヘッドレスCIでも動くようダミードライバーを既定にする（環境変数で上書き可）。
+# dummyビデオではflip/updateがvsync待ちなしの純メモリ操作になり、
+# 計測対象からディスプレイスワップのコストが外れる。
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+import numpy as np
+
+from constants import WINDOW_WIDTH, WINDOW_HEIGHT
+
+pygame.init()
+SCREEN = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+try:
+    # numbaがあれば集計をマシンコード化（cache=Trueで再コンパイルを回避）
+    import numba
+
+    @numba.njit(cache=True)
+    def reduce_timings(deltas_ns):
+        return deltas_ns.min(), deltas_ns.max(), deltas_ns.mean()
+except ImportError:
+    # numba未導入ならNumPyの集約で十分
+    def reduce_timings(deltas_ns):
+        return int(deltas_ns.min()), int(deltas_ns.max()), float(deltas_ns.mean())
+
+
+def make_gm():
+    """共有SCREEN上にGameManagerを作成する。"""
+    from game_manager import GameManager
+    from utils import safe_events
+    return GameManager(SCREEN, event_source=safe_events)
@@ -7,6 +7,38 @@ import pygame
 import sys
 import os
 
+# テストケースは不変なのでモジュールレベルのタプルとして一度だけ構築する
+JAPANESE_TEXTS = (
+    "三人対戦テトリス",
+    "ゲームスタート",
+    "参加する",
+    "参加しない",
+    "一時停止",
+)
+
+ENGLISH_TEXTS = (
+    "TETRIS",
+    "PLAYER 1",
+    "SCORE",
+    "LINES",
+)
+
+def blit_to_atlas(surfaces):
+    """描画済みSurface群をオフスクリーンのアトラスへ一括blitする。
+
+    個別のblit呼び出しの代わりにSurface.blitsで一括転送することで、
+    Python↔C間の往復をテキスト数ぶんから1回に減らす。
+    """
+    atlas_width = max(s.get_width() for s in surfaces)
+    positions = []
+    y = 0
+    for s in surfaces:
+        positions.append((0, y))
+        y += s.get_height()
+    atlas = pygame.Surface((atlas_width, y), pygame.SRCALPHA)
+    atlas.blits(list(zip(surfaces, positions)))
+    return atlas
+
 def test_font_loading():
     """フォント読み込みをテスト"""
     print("=== フォント読み込みテスト ===")
@@ -36,41 +68,36 @@ def test_font_loading():
         
         # 日本語テキスト描画テスト
         print("\n日本語テキスト描画テスト...")
-        japanese_texts = [
-            "三人対戦テトリス",
-            "ゲームスタート", 
-            "参加する",
-            "参加しない",
-            "一時停止"
-        ]
-        
-        for text in japanese_texts:
+        japanese_surfaces = []
+        for text in JAPANESE_TEXTS:
             try:
                 print(f"  テスト: '{text}'")
                 surface = font_mgr.render_text(text, "japanese", 24, (255, 255, 255))
+                japanese_surfaces.append(surface)
                 print(f"    [OK] 描画完了 ({surface.get_width()}x{surface.get_height()})")
             except Exception as e:
                 print(f"    [ERROR] 描画失敗: {e}")
                 return False
-        
+
+        atlas = blit_to_atlas(japanese_surfaces)
+        print(f"  [OK] アトラスへ一括blit ({atlas.get_width()}x{atlas.get_height()})")
+
         # 英語テキストテスト
         print("\n英語テキストテスト...")
-        english_texts = [
-            "TETRIS",
-            "PLAYER 1",
-            "SCORE",
-            "LINES"
-        ]
-        
-        for text in english_texts:
+        english_surfaces = []
+        for text in ENGLISH_TEXTS:
             try:
                 print(f"  テスト: '{text}'")
                 surface = font_mgr.render_text(text, "ui", 24, (255, 255, 255))
+                english_surfaces.append(surface)
                 print(f"    [OK] 描画完了 ({surface.get_width()}x{surface.get_height()})")
             except Exception as e:
                 print(f"    [ERROR] 描画失敗: {e}")
                 return False
-        
+
+        atlas = blit_to_atlas(english_surfaces)
+        print(f"  [OK] アトラスへ一括blit ({atlas.get_width()}x{atlas.get_height()})")
+
         print("\n[SUCCESS] 全フォントテスト完了")
         return True
         
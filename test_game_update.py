@@ -6,21 +6,21 @@
 import pygame
 import sys
 import time
+import traceback
 from constants import *
-from utils import safe_events
-from game_manager import GameManager
+import numpy as np
+from test_fixtures import SCREEN, make_gm, reduce_timings
 
 def test_game_update():
     """ゲーム開始後の更新処理をテスト"""
     print("=== ゲーム更新処理テスト ===")
     
     try:
-        pygame.init()
-        screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        screen = SCREEN  # test_fixtures で初期化済み
         print("[OK] pygame初期化")
-        
+
         # GameManager作成
-        gm = GameManager(screen, event_source=safe_events)
+        gm = make_gm()
         print("[OK] GameManager作成")
         
         # ゲーム開始
@@ -35,59 +35,75 @@ def test_game_update():
         # 1. Update処理
         print("1. Update処理テスト...")
         try:
-            start_time = time.time()
+            t0 = time.perf_counter_ns()
             gm.update(1.0/60.0)
-            elapsed = time.time() - start_time
-            print(f"   [OK] Update処理 ({elapsed:.4f}秒)")
+            dt_ns = time.perf_counter_ns() - t0
+            print(f"   [OK] Update処理 ({dt_ns / 1e9:.4f}秒)")
         except Exception as e:
             print(f"   [ERROR] Update処理失敗: {e}")
             return False
-        
+
         # 2. Draw処理
         print("2. Draw処理テスト...")
         try:
-            start_time = time.time()
+            t0 = time.perf_counter_ns()
             gm.draw(screen)
-            elapsed = time.time() - start_time
-            print(f"   [OK] Draw処理 ({elapsed:.4f}秒)")
+            dt_ns = time.perf_counter_ns() - t0
+            print(f"   [OK] Draw処理 ({dt_ns / 1e9:.4f}秒)")
         except Exception as e:
             print(f"   [ERROR] Draw処理失敗: {e}")
-            import traceback
             traceback.print_exc()
             return False
-        
+
         # 3. Display flip
         print("3. Display flip...")
         try:
-            start_time = time.time()
+            t0 = time.perf_counter_ns()
             pygame.display.flip()
-            elapsed = time.time() - start_time
-            print(f"   [OK] Display flip ({elapsed:.4f}秒)")
+            dt_ns = time.perf_counter_ns() - t0
+            print(f"   [OK] Display flip ({dt_ns / 1e9:.4f}秒)")
         except Exception as e:
             print(f"   [ERROR] Display flip失敗: {e}")
             return False
-        
+
         # 連続更新テスト
         print("\n連続更新テスト（10フレーム）...")
+        # 計測への影響を抑えるため、ループ内の属性参照とprintを避ける
+        gm_update = gm.update
+        gm_draw = gm.draw
+        display_update = pygame.display.update
+        perf_ns = time.perf_counter_ns
+        deltas = np.empty(10, np.int64)
+        err_frame, err_exc = None, None
         for i in range(10):
             try:
-                start_time = time.time()
-                
-                gm.update(1.0/60.0)
-                gm.draw(screen)
-                pygame.display.flip()
-                
-                elapsed = time.time() - start_time
-                print(f"   フレーム {i+1}: {elapsed:.4f}秒")
-                
-                if elapsed > 0.1:  # 100ms以上かかったら警告
-                    print(f"   [WARN] フレーム {i+1} が遅い ({elapsed:.4f}秒)")
-                
+                t0 = perf_ns()
+
+                gm_update(1.0/60.0)
+                dirty = gm_draw(screen)
+                display_update(dirty)
+
+                deltas[i] = perf_ns() - t0
             except Exception as e:
-                print(f"   [ERROR] フレーム {i+1} 失敗: {e}")
-                import traceback
-                traceback.print_exc()
-                return False
+                # 例外整形をループ外に追い出し、計測対象のフレーム時間を汚さない
+                err_frame, err_exc = i, e
+                break
+
+        if err_exc is not None:
+            print(f"   [ERROR] フレーム {err_frame+1} 失敗: {err_exc}")
+            traceback.print_exception(err_exc)
+            return False
+
+        # float整形(%.4f)は1回数十µsかかるため、整数nsのままbytesで組み立てて一括出力する
+        out = bytearray()
+        for i, dt_ns in enumerate(deltas):
+            out += b"   frame %d: %d ns\n" % (i + 1, dt_ns)
+            if dt_ns > 100_000_000:  # 100ms以上かかったら警告
+                out += b"   [WARN] frame %d slow (%d ns)\n" % (i + 1, dt_ns)
+        min_ns, max_ns, mean_ns = reduce_timings(deltas)
+        out += b"   min/max/mean: %d/%d/%d ns\n" % (min_ns, max_ns, int(mean_ns))
+        sys.stdout.buffer.write(out)
+        sys.stdout.flush()
         
         print("[SUCCESS] 全フレーム処理完了")
         
@@ -97,7 +113,6 @@ def test_game_update():
         
     except Exception as e:
         print(f"[ERROR] テスト失敗: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
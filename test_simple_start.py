@@ -7,32 +7,28 @@ import pygame
 import sys
 import time
 from constants import *
+from test_fixtures import SCREEN, make_gm
 
 def test_simple_start():
     """最小限のstart_gameテスト"""
     print("=== 最小限start_gameテスト ===")
     
     try:
-        pygame.init()
-        screen = pygame.display.set_mode((800, 600))
+        screen = SCREEN  # test_fixtures で初期化済み
         print("[OK] pygame初期化")
-        
-        # GameManagerの必要な部分だけをテスト
-        from game_manager import GameManager
-        from utils import safe_events
-        
+
         print("GameManager作成...")
-        gm = GameManager(screen, event_source=safe_events)
+        gm = make_gm()
         print("[OK] GameManager作成完了")
         
         print("start_game()呼び出し...")
-        start_time = time.time()
-        
+        t0 = time.perf_counter_ns()
+
         # start_gameを直接呼び出し
         gm.start_game()
-        
-        elapsed = time.time() - start_time
-        print(f"[OK] start_game()完了 ({elapsed:.3f}秒)")
+
+        dt_ns = time.perf_counter_ns() - t0
+        print(f"[OK] start_game()完了 ({dt_ns / 1e9:.3f}秒)")
         
         print(f"状態: {gm.state}")
         print(f"ゲーム数: {len(gm.games)}")
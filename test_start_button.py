@@ -8,22 +8,20 @@ import sys
 import time
 import traceback
 from constants import *
-from utils import safe_events
-from game_manager import GameManager
+from test_fixtures import SCREEN, make_gm
 
 def test_start_button_press():
     """スタートボタン押下をシミュレート"""
     print("=== スタートボタン押下テスト ===")
     
     try:
-        # pygame初期化
-        pygame.init()
-        screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        # pygame初期化（test_fixtures で共有初期化済み）
+        screen = SCREEN
         print("[OK] pygame初期化完了")
-        
+
         # GameManager作成
         print("GameManager作成中...")
-        gm = GameManager(screen, event_source=safe_events)
+        gm = make_gm()
         print("[OK] GameManager作成完了")
         
         # 初期状態確認
@@ -59,6 +57,7 @@ def test_start_button_press():
         
         # 少し更新してみる
         print("\nゲーム更新テスト...")
+        err_frame, err_exc = None, None
         for i in range(10):
             print(f"フレーム {i+1}/10", end="\r")
             try:
@@ -67,10 +66,15 @@ def test_start_button_press():
                 pygame.display.flip()
                 time.sleep(0.01)  # 10ms待機
             except Exception as e:
-                print(f"\n[ERROR] フレーム {i+1} で失敗: {e}")
-                traceback.print_exc()
-                return False
-        
+                # ループ内でのフォーマット処理は計測を汚すため、記録だけして抜ける
+                err_frame, err_exc = i, e
+                break
+
+        if err_exc is not None:
+            print(f"\n[ERROR] フレーム {err_frame+1} で失敗: {err_exc}")
+            traceback.print_exception(err_exc)
+            return False
+
         print(f"\n[OK] 10フレーム更新完了")
         
         # クリーンアップ
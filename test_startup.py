@@ -4,26 +4,30 @@
 import sys
 import traceback
 
+# pygame.init()はSDLの全サブシステムを立ち上げ直すため、
+# 各サブテストで繰り返さず __main__ で一度だけ行い全テストで共有する
+import pygame
+
 def test_imports():
     """Test each import individually."""
     print("Testing imports...")
-    
+
     try:
         import pygame
         print("[OK] pygame imported")
-        
+
         import os
         print("[OK] os imported")
-        
+
         import time
         print("[OK] time imported")
-        
+
         from utils import safe_events
         print("[OK] utils.safe_events imported")
-        
+
         from game_manager import GameManager
         print("[OK] GameManager imported")
-        
+
         return True
     except Exception as e:
         print(f"[ERROR] Import failed: {e}")
@@ -33,18 +37,17 @@ def test_imports():
 def test_pygame_init():
     """Test pygame initialization."""
     print("\nTesting pygame initialization...")
-    
+
     try:
-        import pygame
-        pygame.init()
-        print("[OK] pygame.init() successful")
-        
+        # 全体のinit/quitは共有しているので、ディスプレイサブシステムだけを
+        # 立ち上げ直して初期化経路を検証する
+        pygame.display.quit()
+        pygame.display.init()
+        print("[OK] pygame display re-init successful")
+
         screen = pygame.display.set_mode((800, 600))
         print("[OK] Display mode set")
-        
-        pygame.quit()
-        print("[OK] pygame.quit() successful")
-        
+
         return True
     except Exception as e:
         print(f"[ERROR] Pygame init failed: {e}")
@@ -54,19 +57,15 @@ def test_pygame_init():
 def test_audio():
     """Test audio system."""
     print("\nTesting audio system...")
-    
+
     try:
-        import pygame
-        pygame.init()
-        
         from audio_manager import AudioManager
         audio = AudioManager()
         print("[OK] AudioManager created")
-        
+
         audio.cleanup()
-        pygame.quit()
         print("[OK] Audio cleanup successful")
-        
+
         return True
     except Exception as e:
         print(f"[ERROR] Audio test failed: {e}")
@@ -76,18 +75,14 @@ def test_audio():
 def test_fonts():
     """Test font system."""
     print("\nTesting font system...")
-    
+
     try:
-        import pygame
-        pygame.init()
-        
         from font_manager import get_font_manager
         font_mgr = get_font_manager()
         print("[OK] FontManager created")
-        
-        pygame.quit()
+
         print("[OK] Font test successful")
-        
+
         return True
     except Exception as e:
         print(f"[ERROR] Font test failed: {e}")
@@ -95,22 +90,26 @@ def test_fonts():
         return False
 
 if __name__ == "__main__":
+    pygame.init()
+
     tests = [
         test_imports,
         test_pygame_init,
         test_audio,
         test_fonts
     ]
-    
+
     all_passed = True
     for test in tests:
         if not test():
             all_passed = False
             break
-    
+
+    pygame.quit()
+
     if all_passed:
         print("\n[SUCCESS] All tests passed! The game should work.")
     else:
         print("\n[FAILED] Some tests failed.")
-    
-    sys.exit(0 if all_passed else 1)
\ No newline at end of file
+
+    sys.exit(0 if all_passed else 1)
@@ -6,21 +6,21 @@ UI描画処理のテスト
 import pygame
 import sys
 import time
+import traceback
 from constants import *
-from utils import safe_events
-from game_manager import GameManager
+import numpy as np
+from test_fixtures import SCREEN, make_gm, reduce_timings
 
 def test_ui_rendering():
     """UI描画処理の個別テスト"""
     print("=== UI描画処理テスト ===")
     
     try:
-        pygame.init()
-        screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        screen = SCREEN  # test_fixtures で初期化済み
         print("[OK] pygame初期化")
-        
+
         # GameManager作成（ゲーム開始まで）
-        gm = GameManager(screen, event_source=safe_events)
+        gm = make_gm()
         gm.start_game()
         print("[OK] ゲーム開始完了")
         
@@ -30,59 +30,74 @@ def test_ui_rendering():
         # 1. 背景描画
         print("1. 背景描画...")
         try:
-            start_time = time.time()
+            t0 = time.perf_counter_ns()
             screen.fill(Colors.BG_PRIMARY)
-            elapsed = time.time() - start_time
-            print(f"   [OK] 背景描画 ({elapsed:.4f}秒)")
+            dt_ns = time.perf_counter_ns() - t0
+            print(f"   [OK] 背景描画 ({dt_ns / 1e9:.4f}秒)")
         except Exception as e:
             print(f"   [ERROR] 背景描画失敗: {e}")
             return False
-        
+
         # 2. UIRenderer.draw_game_hud
         print("2. draw_game_hud...")
         try:
-            start_time = time.time()
+            t0 = time.perf_counter_ns()
             gm.ui_renderer.draw_game_hud(gm.games, gm.active_players)
-            elapsed = time.time() - start_time
-            print(f"   [OK] draw_game_hud ({elapsed:.4f}秒)")
+            dt_ns = time.perf_counter_ns() - t0
+            print(f"   [OK] draw_game_hud ({dt_ns / 1e9:.4f}秒)")
         except Exception as e:
             print(f"   [ERROR] draw_game_hud失敗: {e}")
-            import traceback
             traceback.print_exc()
             return False
-        
+
         # 3. Display flip
         print("3. Display flip...")
         try:
-            start_time = time.time()
+            t0 = time.perf_counter_ns()
             pygame.display.flip()
-            elapsed = time.time() - start_time
-            print(f"   [OK] Display flip ({elapsed:.4f}秒)")
+            dt_ns = time.perf_counter_ns() - t0
+            print(f"   [OK] Display flip ({dt_ns / 1e9:.4f}秒)")
         except Exception as e:
             print(f"   [ERROR] Display flip失敗: {e}")
             return False
-        
+
         # 4. 完全な描画処理テスト
         print("\n完全描画処理テスト（5フレーム）...")
+        # 計測への影響を抑えるため、ループ内の属性参照とprintを避ける
+        gm_draw = gm.draw
+        display_update = pygame.display.update
+        perf_ns = time.perf_counter_ns
+        deltas = np.empty(5, np.int64)
+        err_frame, err_exc = None, None
         for i in range(5):
             try:
-                start_time = time.time()
-                
-                # gm.draw()を直接使用
-                gm.draw(screen)
-                pygame.display.flip()
-                
-                elapsed = time.time() - start_time
-                print(f"   フレーム {i+1}: {elapsed:.4f}秒")
-                
-                if elapsed > 0.1:
-                    print(f"   [WARN] フレーム {i+1} が遅い")
-                
+                t0 = perf_ns()
+
+                # gm.draw()を直接使用、返り値のダーティ矩形だけを転送
+                dirty = gm_draw(screen)
+                display_update(dirty)
+
+                deltas[i] = perf_ns() - t0
             except Exception as e:
-                print(f"   [ERROR] フレーム {i+1} 失敗: {e}")
-                import traceback
-                traceback.print_exc()
-                return False
+                # 例外整形をループ外に追い出し、計測対象のフレーム時間を汚さない
+                err_frame, err_exc = i, e
+                break
+
+        if err_exc is not None:
+            print(f"   [ERROR] フレーム {err_frame+1} 失敗: {err_exc}")
+            traceback.print_exception(err_exc)
+            return False
+
+        # float整形(%.4f)は1回数十µsかかるため、整数nsのままbytesで組み立てて一括出力する
+        out = bytearray()
+        for i, dt_ns in enumerate(deltas):
+            out += b"   frame %d: %d ns\n" % (i + 1, dt_ns)
+            if dt_ns > 100_000_000:
+                out += b"   [WARN] frame %d slow\n" % (i + 1)
+        min_ns, max_ns, mean_ns = reduce_timings(deltas)
+        out += b"   min/max/mean: %d/%d/%d ns\n" % (min_ns, max_ns, int(mean_ns))
+        sys.stdout.buffer.write(out)
+        sys.stdout.flush()
         
         print("\n[SUCCESS] UI描画テスト完了")
         
@@ -92,7 +107,6 @@ def test_ui_rendering():
         
     except Exception as e:
         print(f"[ERROR] テスト失敗: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -7,7 +7,7 @@ import pygame
 import sys
 import time
 from constants import *
-from utils import safe_events
+from utils import safe_events, precise_sleep
 from game_manager import GameManager
 
 def test_xbox_only_freeze_fix():
@@ -43,6 +43,7 @@ def test_xbox_only_freeze_fix():
         
         while time.time() - test_start < 10.0 and gm.running:
             loop_start = time.time()
+            frame_deadline_ns = time.perf_counter_ns() + 16_666_667  # 60 FPS target
             
             gm.handle_events()
             gm.update(1.0/60.0)
@@ -56,7 +57,7 @@ def test_xbox_only_freeze_fix():
             if loop_time > 0.1:  # 100ms以上かかったら警告
                 print(f"[WARN] フレーム {frame_count} が遅い: {loop_time:.3f}秒")
             
-            time.sleep(max(0, 1.0/60.0 - loop_time))  # 60 FPS target
+            precise_sleep(frame_deadline_ns)  # sleep + spin-wait hybrid, sub-ms jitter
         
         elapsed = time.time() - test_start
         fps = frame_count / elapsed
@@ -3,6 +3,45 @@ Utility functions for the Tetris game.
 """
 
 import pygame
+import time
+
+# Ring buffer of recently observed ``time.sleep(0.001)`` durations in ns.
+# Power-of-two size so the write index wraps with a simple mask.
+_SLEEP_TIME_MASK = 63
+_sleep_times_ns = [2_000_000] * (_SLEEP_TIME_MASK + 1)
+_sleep_time_index = 0
+
+def precise_sleep(deadline_ns: int, on_slice=None):
+    """Sleep until ``time.perf_counter_ns()`` reaches ``deadline_ns``.
+
+    ``time.sleep`` alone can oversleep by 1-16 ms depending on the OS
+    scheduler.  This sleeps in 1 ms slices while the remaining time
+    exceeds the worst slice duration observed recently, then spin-waits
+    the final stretch for sub-millisecond accuracy.
+
+    ``on_slice``, if given, is called before every 1 ms slice — the game
+    loop passes ``pygame.event.pump`` so SDL input state stays at most a
+    couple of ms stale while the frame budget is slept off, without
+    turning the wait into a busy-spin.
+    """
+
+    global _sleep_time_index
+
+    worst_ns = max(_sleep_times_ns)
+    while deadline_ns - time.perf_counter_ns() > worst_ns:
+        if on_slice is not None:
+            on_slice()
+        slice_start = time.perf_counter_ns()
+        time.sleep(0.001)
+        _sleep_times_ns[_sleep_time_index & _SLEEP_TIME_MASK] = (
+            time.perf_counter_ns() - slice_start
+        )
+        _sleep_time_index += 1
+        worst_ns = max(_sleep_times_ns)
+
+    # Spin-wait the remainder
+    while time.perf_counter_ns() < deadline_ns:
+        pass
 
 def safe_events():
     """Safely retrieve pending pygame events.
@@ -11,13 +50,15 @@ def safe_events():
     ``pygame.event.get`` directly, which can spam the console and halt
     input processing.  This helper pumps the event queue first and
     gracefully returns an empty list if any exception is raised.
+
+    ``pygame.event.get()`` pumps SDL itself and then drains the whole
+    queue through one batched ``SDL_PeepEvents`` call in C, so a single
+    get per frame is the cheapest way to collect events; never poll them
+    one at a time and never pump separately first.
     """
 
     try:
-        # Ensure SDL processes internal actions before fetching events.
-        pygame.event.pump()
-        events = pygame.event.get()
-        return events
+        return pygame.event.get()
     except SystemError as e:
         # Handle Joy-Con controller crashes specifically
         if "exception set" in str(e):